@@ -0,0 +1,81 @@
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# modulos que nao podem ser carregados nesses caminhos de inicializacao
+SERVE_FORBIDDEN = ("cryptography", "srptools", "sqlite3", "client.client", "client.history", "crypto")
+CONNECT_FORBIDDEN = ("sqlite3", "client.history", "server.server", "srptools")
+
+# (nome, argumentos, modulos proibidos, orcamento em ms)
+# connect precisa do cryptography, por isso o orcamento maior
+CASES = [
+    ("terminal_chat.py --help", ["terminal_chat.py", "--help"], SERVE_FORBIDDEN, 100.0),
+    ("import server.server", ["-c", "import server.server"], SERVE_FORBIDDEN, 100.0),
+    ("import client.client", ["-c", "import client.client"], CONNECT_FORBIDDEN, 140.0),
+]
+
+def run_case(args, baseline=frozenset()):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=ROOT,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Command failed: {result.stderr.strip().splitlines()[-1:]}")
+
+    modules = []
+    total_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        modules.append(name)
+        if name not in baseline: #so conta o que o caso carrega alem do interpretador
+            total_us += int(self_us)
+    return modules, total_us / 1000
+
+
+def forbidden_in(modules, forbidden) -> list:
+    return sorted({
+        name for name in forbidden for module in modules
+        if module == name or module.startswith(name + ".")
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check CLI import time and lazy imports")
+    parser.add_argument("--budget-ms", type=float, help="Override the import time budget of every case (excludes interpreter startup)")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per case, the fastest one is used")
+    args = parser.parse_args()
+
+    baseline = frozenset(run_case(["-c", "pass"])[0])
+
+    failed = False
+    for label, case_args, forbidden, budget_ms in CASES:
+        budget_ms = args.budget_ms or budget_ms
+        best = None
+        for _ in range(args.runs):
+            modules, total_ms = run_case(case_args, baseline)
+            best = total_ms if best is None else min(best, total_ms)
+
+        loaded = forbidden_in(modules, forbidden)
+        status = "ok"
+        if loaded:
+            status = f"FAIL: loads {', '.join(loaded)}"
+            failed = True
+        elif best > budget_ms:
+            status = f"FAIL: over budget of {budget_ms:.0f} ms"
+            failed = True
+
+        print(f"{label:<26} {best:7.1f} ms  {status}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
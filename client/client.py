@@ -1,13 +1,16 @@
 import asyncio
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
 from crypto.kdf import derive_room_key
 from crypto.encrypt import fernet_from_key, encrypt, decrypt
 from protocol.messages import encode, decode
 from client.ui import input_loop, ColoredUI
 
+if TYPE_CHECKING:
+    from client.history import HistoryStore
+
 
 class ChatClient: #client side
-    def __init__(self, host: str, port: int, username: str, password: str):
+    def __init__(self, host: str, port: int, username: str, password: str, history_path: Optional[str] = None):
         self.host = host
         self.port = port
         self.username = username
@@ -17,6 +20,8 @@ class ChatClient: #client side
         self.fernet = None
         self.ui = ColoredUI()
         self.is_connected = False
+        self.history_path = history_path
+        self.history: Optional["HistoryStore"] = None
     
     async def connect(self) -> bool:
         try:
@@ -70,6 +75,14 @@ class ChatClient: #client side
             await self.close()
             return False
         
+        if self.history_path:
+            try:
+                from client.history import HistoryStore #sqlite so e carregado se o historico estiver ativo
+                self.history = HistoryStore(self.history_path, self.password, room_salt)
+                self.history.start(self.ui.print_error)
+            except Exception as e:
+                self.ui.print_error(f"History disabled: {e}")
+        
         self.is_connected = True
         self.ui.print_success(f"Connected to secure room as '{self.username}'")
         
@@ -98,8 +111,31 @@ class ChatClient: #client side
             except Exception:
                 pass
         
+        await self.close_history()
+        
         self.ui.print_info("You left the room.")
     
+    async def close_history(self):
+        if self.history:
+            history, self.history = self.history, None
+            try:
+                await history.close()
+            except Exception as e:
+                self.ui.print_error(f"Failed to save history: {e}")
+    
+    async def search_history(self, query: str):
+        if not self.history:
+            self.ui.print_error("History is not enabled (use --history PATH)")
+            return
+        
+        try:
+            results = await self.history.search(query)
+        except Exception as e:
+            self.ui.print_error(f"Search failed: {e}")
+            return
+        
+        self.ui.print_search_results(query, results)
+    
     async def receive_messages(self):
         try:
             while self.is_connected and self.reader:
@@ -120,6 +156,9 @@ class ChatClient: #client side
                         text = decrypt(self.fernet, msg["text"])
                         sender = msg["user"]
                         
+                        if self.history:
+                            self.history.record(sender, text)
+                        
                         if sender != self.username: #não mostra a propria mensagem, pra não duplicar...
                             self.ui.print_message(sender, text, reprint_prompt=True, prompt_username=self.username)
                         
@@ -143,7 +182,7 @@ class ChatClient: #client side
         
         try:
             await asyncio.gather(
-                input_loop(self.send_message, self.close, self.ui, self.username),
+                input_loop(self.send_message, self.close, self.ui, self.username, self.search_history),
                 self.receive_messages()
             )
         except Exception as e:
@@ -152,6 +191,6 @@ class ChatClient: #client side
             await self.close()
 
 
-async def start_client(host: str, port: int, username: str, password: str):
-    client = ChatClient(host, port, username, password)
+async def start_client(host: str, port: int, username: str, password: str, history_path: Optional[str] = None):
+    client = ChatClient(host, port, username, password, history_path)
     await client.run()
\ No newline at end of file
@@ -0,0 +1,209 @@
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from cryptography.fernet import Fernet
+from crypto.kdf import derive_room_key, derive_history_keys
+from crypto.encrypt import fernet_from_key, encrypt, decrypt
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rooms (
+    id INTEGER PRIMARY KEY, room_salt BLOB UNIQUE NOT NULL, salt BLOB NOT NULL, check_value BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY, room_id INTEGER NOT NULL, ts REAL NOT NULL, body TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(tokens, content='');
+"""
+
+class HistoryError(Exception):
+    pass
+
+
+class HistoryStore:
+    # mensagens ficam cifradas com fernet; o indice fts so guarda hmac dos termos.
+    # cada room_salt (um por execucao do servidor) tem suas proprias chaves, derivadas
+    # da senha, entao o historico continua legivel depois que o servidor reinicia
+    def __init__(self, path: str, password: str, room_salt: bytes, flush_interval: float = 0.5, batch_size: int = 256):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._pending: List[Tuple[float, str, str]] = []
+        self._lock = threading.Lock()
+        self._accepting = True
+        self._closed = False
+        self._stop = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._rooms: Dict[int, Tuple[Fernet, bytes]] = {}
+
+        try:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+        except sqlite3.Error as e:
+            raise HistoryError(f"Could not open history at {path}: {e}")
+
+        try:
+            self._room_id = self._open_room(password, room_salt)
+        except HistoryError:
+            self._db.close()
+            raise
+        except Exception as e:
+            self._db.close()
+            raise HistoryError(f"Could not open history at {path}: {e}")
+
+    def _open_room(self, password: str, room_salt: bytes) -> int:
+        self._db.executescript(SCHEMA)
+        current = None
+        for room_id, known_salt, salt, check in self._db.execute("SELECT id, room_salt, salt, check_value FROM rooms"):
+            fernet, index_key = self._room_keys(password, bytes(known_salt), bytes(salt))
+            if not hmac.compare_digest(bytes(check), self._check_value(index_key)):
+                if bytes(known_salt) == room_salt:
+                    raise HistoryError("History file was created with a different room password; use a new --history path")
+                continue #sala com outra senha, fica fora da busca
+            self._rooms[room_id] = (fernet, index_key)
+            if bytes(known_salt) == room_salt:
+                current = room_id
+
+        if current is None:
+            salt = os.urandom(16)
+            fernet, index_key = self._room_keys(password, room_salt, salt)
+            with self._db:
+                cursor = self._db.execute(
+                    "INSERT INTO rooms (room_salt, salt, check_value) VALUES (?, ?, ?)",
+                    (room_salt, salt, self._check_value(index_key))
+                )
+            current = cursor.lastrowid
+            self._rooms[current] = (fernet, index_key)
+        return current
+
+    @staticmethod
+    def _room_keys(password: str, room_salt: bytes, salt: bytes) -> Tuple[Fernet, bytes]:
+        storage_key, index_key = derive_history_keys(derive_room_key(password, room_salt), salt)
+        return fernet_from_key(storage_key), index_key
+
+    @staticmethod
+    def _check_value(index_key: bytes) -> bytes:
+        return hmac.new(index_key, b"history-check", hashlib.sha256).digest()
+
+    @staticmethod
+    def _tokens(index_key: bytes, text: str) -> List[str]:
+        seen = dict.fromkeys(TOKEN_PATTERN.findall(text.casefold()))
+        return [
+            hmac.new(index_key, token.encode('utf-8'), hashlib.sha256).hexdigest()[:32]
+            for token in seen
+        ]
+
+    def record(self, sender: str, text: str):
+        # chamado no loop de recebimento, entao so enfileira
+        if self._accepting:
+            self._pending.append((time.time(), sender, text))
+
+    def _write_batch(self, batch: List[Tuple[float, str, str]]):
+        fernet, index_key = self._rooms[self._room_id]
+        rows = []
+        for ts, sender, text in batch:
+            body = encrypt(fernet, json.dumps({"user": sender, "text": text}, ensure_ascii=False))
+            rows.append((ts, body, " ".join(self._tokens(index_key, f"{sender} {text}"))))
+
+        with self._lock:
+            try:
+                with self._db:
+                    for ts, body, tokens in rows:
+                        cursor = self._db.execute(
+                            "INSERT INTO messages (room_id, ts, body) VALUES (?, ?, ?)",
+                            (self._room_id, ts, body)
+                        )
+                        self._db.execute(
+                            "INSERT INTO messages_fts (rowid, tokens) VALUES (?, ?)",
+                            (cursor.lastrowid, tokens)
+                        )
+            except sqlite3.Error as e:
+                raise HistoryError(f"Failed to write history: {e}")
+
+    async def flush(self):
+        # um flush por vez: mantem a ordem dos ids e faz a busca esperar o lote em andamento
+        async with self._flush_lock:
+            while self._pending:
+                batch = self._pending[:self.batch_size]
+                del self._pending[:self.batch_size]
+                await asyncio.to_thread(self._write_batch, batch)
+
+    def start(self, on_error: Callable[[str], None]):
+        self._task = asyncio.create_task(self._flush_loop(on_error))
+
+    async def _flush_loop(self, on_error: Callable[[str], None]):
+        while not self._stop.is_set():
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+
+            try:
+                await self.flush()
+            except Exception as e:
+                # para de enfileirar, senao _pending cresce sem limite
+                self._accepting = False
+                self._pending.clear()
+                on_error(f"History disabled: {e}")
+                return
+
+    def _search(self, query: str, limit: int) -> List[Tuple[float, str, str]]:
+        if not TOKEN_PATTERN.findall(query.casefold()):
+            return []
+
+        # os termos sao hasheados com a chave de cada sala, entao busca sala por sala
+        found = []
+        for room_id, (fernet, index_key) in self._rooms.items():
+            tokens = self._tokens(index_key, query)
+            match = " ".join(f'"{token}"' for token in tokens)
+            with self._lock:
+                try:
+                    rows = self._db.execute(
+                        "SELECT m.id, m.ts, m.body FROM messages_fts JOIN messages m ON m.id = messages_fts.rowid "
+                        "WHERE messages_fts MATCH ? AND m.room_id = ? ORDER BY messages_fts.rowid DESC LIMIT ?",
+                        (match, room_id, limit)
+                    ).fetchall()
+                except sqlite3.Error as e:
+                    raise HistoryError(f"Search failed: {e}")
+            found.extend((message_id, ts, fernet, body) for message_id, ts, body in rows)
+
+        found.sort(key=lambda row: row[0], reverse=True)
+        results = []
+        for _, ts, fernet, body in reversed(found[:limit]):
+            entry = json.loads(decrypt(fernet, body))
+            results.append((ts, entry["user"], entry["text"]))
+        return results
+
+    async def search(self, query: str, limit: int = 20) -> List[Tuple[float, str, str]]:
+        await self.flush()
+        return await asyncio.to_thread(self._search, query, limit)
+
+    def _close_db(self):
+        with self._lock:
+            self._db.close()
+
+    async def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._stop.set()
+
+        # espera o lote em andamento terminar antes de fechar o banco
+        if self._task:
+            await self._task
+            self._task = None
+
+        try:
+            if self._accepting:
+                self._accepting = False
+                await self.flush()
+        finally:
+            await asyncio.to_thread(self._close_db)
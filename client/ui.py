@@ -1,6 +1,7 @@
 import asyncio
 import sys
-from typing import Callable, Awaitable
+import time
+from typing import Callable, Awaitable, List, Optional, Tuple
 
 
 class Colors: # testar com outros terminais sem ser o do vs code dps
@@ -70,6 +71,18 @@ class ColoredUI:
         color = self.get_username_color(username)
         print(f"{color}{Colors.BOLD}{username}{Colors.RESET}: ", end="", flush=True)
     
+    def print_search_results(self, query: str, results: List[Tuple[float, str, str]]):
+        if not results:
+            self.print_info(f"No messages found for '{query}'")
+            return
+        
+        print(f"\n{Colors.BRIGHT_CYAN}Results for '{query}' ({len(results)}):{Colors.RESET}")
+        for ts, sender, text in results:
+            stamp = time.strftime('%Y-%m-%d %H:%M', time.localtime(ts))
+            color = self.get_username_color(sender)
+            print(f"  {Colors.BRIGHT_BLACK}{stamp}{Colors.RESET} {color}{Colors.BOLD}{sender}{Colors.RESET}: {text}")
+        print()
+    
     def print_info(self, text: str):
         print(f"{Colors.BRIGHT_BLUE}{text}{Colors.RESET}")
     
@@ -84,10 +97,11 @@ async def input_loop(
     send: Callable[[str], Awaitable[None]],
     close: Callable[[], Awaitable[None]],
     ui: ColoredUI,
-    username: str
+    username: str,
+    search: Optional[Callable[[str], Awaitable[None]]] = None
 ):
 
-    ui.print_info("\nCommands: /quit to exit, /help for help\n")
+    ui.print_info("\nCommands: /quit to exit, /search <words> to search history, /help for help\n")
     
     while True:
         try:
@@ -102,9 +116,20 @@ async def input_loop(
             elif text.strip() == "/help":
                 print(f"\n{Colors.BRIGHT_CYAN}Available commands:{Colors.RESET}")
                 print(f"  {Colors.YELLOW}/quit{Colors.RESET}  - Leave the chat room")
+                print(f"  {Colors.YELLOW}/search <words>{Colors.RESET}  - Search saved message history")
                 print(f"  {Colors.YELLOW}/help{Colors.RESET}  - Show this help message\n")
                 continue
             
+            elif text.strip() == "/search" or text.strip().startswith("/search "):
+                query = text.strip()[len("/search"):].strip()
+                if not query:
+                    ui.print_error("Usage: /search <words>")
+                elif search:
+                    await search(query)
+                else:
+                    ui.print_error("History is not enabled")
+                continue
+            
             elif text.strip() == "":
                 continue
             
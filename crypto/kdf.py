@@ -1,3 +1,4 @@
+from typing import Tuple
 from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.backends import default_backend
@@ -46,4 +47,27 @@ def verify_derived_key(password: str, salt: bytes, expected_key: bytes, length:
         hkdf.verify(password.encode('utf-8'), expected_key)
         return True
     except Exception:
-        return False
\ No newline at end of file
+        return False
+
+def derive_history_keys(room_key: bytes, salt: bytes) -> Tuple[bytes, bytes]:
+    if not isinstance(room_key, bytes):
+        raise KDFError("Room key must be bytes")
+    
+    if not isinstance(salt, bytes):
+        raise KDFError("Salt must be bytes")
+    
+    if len(salt) < 16:
+        raise KDFError(f"Salt should be at least 16 bytes, got {len(salt)}")
+    
+    try:
+        hkdf = HKDF(
+            algorithm=hashes.SHA256(),
+            length=64,
+            salt=salt,
+            info=b"cmd-chat-history-key",
+            backend=default_backend()
+        )
+        material = hkdf.derive(room_key)
+        return material[:32], material[32:] #storage key, index key
+    except Exception as e:
+        raise KDFError(f"History key derivation failed: {e}")
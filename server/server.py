@@ -4,14 +4,15 @@ import logging
 from protocol.messages import encode, decode, create_error_message, create_init_message
 from server.state import ServerState
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
-)
-
 logger = logging.getLogger(__name__)
 
+def setup_logging():
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+
 class ChatServer:
     def __init__(self, password: str):
         self.state = ServerState(password)
@@ -94,6 +95,7 @@ class ChatServer:
 
 
 async def start_server(host: str, port: int, password: str):
+    setup_logging()
     server_instance = ChatServer(password)
     
     try:
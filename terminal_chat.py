@@ -1,8 +1,6 @@
 import argparse
 import asyncio
 import sys
-from server.server import start_server
-from client.client import start_client
 
 def parse_arguments():
     parser = argparse.ArgumentParser(
@@ -15,6 +13,9 @@ Examples:
   
   Connect as client:
     python terminal_chat.py connect localhost 5000 Alice mypassword
+  
+  Connect with searchable local history:
+    python terminal_chat.py connect localhost 5000 Alice mypassword --history alice.db
         """
     )
     subparsers = parser.add_subparsers(dest="cmd", help="Command to execute")
@@ -27,6 +28,7 @@ Examples:
     connect_parser.add_argument("port", type=int, help="Server port number")
     connect_parser.add_argument("username", help="Your display name in the chat")
     connect_parser.add_argument("password", help="Room password")
+    connect_parser.add_argument("--history", metavar="PATH", help="Save messages to an encrypted local history file (enables /search)")
     return parser.parse_args()
 
 def validate_args(args):
@@ -61,13 +63,16 @@ def main():
 
     try:
         if args.cmd == "serve":
+            from server.server import start_server #imports tardios, so carrega o necessario pro subcomando
             asyncio.run(start_server(args.host, args.port, args.password))
         elif args.cmd == "connect":
+            from client.client import start_client
             asyncio.run(start_client(
                 args.host,
                 args.port,
                 args.username,
-                args.password
+                args.password,
+                args.history
             ))
     except KeyboardInterrupt:
         print("\n\nShutting down...")